@@ -12,17 +12,15 @@
 # language governing permissions and limitations under the License.
 from __future__ import absolute_import
 
-from glob import glob
 import os
-from os.path import basename
-from os.path import splitext
 import sys
 
-from setuptools import find_packages, setup
+from setuptools import setup
 
 
 def read(fname):
-    return open(os.path.join(os.path.dirname(__file__), fname)).read()
+    with open(os.path.join(os.path.dirname(__file__), fname), "rb") as f:
+        return f.read().decode("utf-8")
 
 
 def read_version():
@@ -56,9 +54,8 @@ setup(
     version=read_version(),
     description="Open source library for using "
     "TensorFlow to train models on on Amazon SageMaker.",
-    packages=find_packages(where="src", exclude=("test",)),
+    packages=["sagemaker_tensorflow_container"],
     package_dir={"": "src"},
-    py_modules=[splitext(basename(path))[0] for path in glob("src/*.py")],
     long_description=read("README.rst"),
     author="Amazon Web Services",
     url="https://github.com/aws/sagemaker-tensorflow-training-toolkit",
@@ -14,13 +14,14 @@ from __future__ import absolute_import
 
 import json
 import logging
-import multiprocessing
 import os
-import subprocess
+import posixpath
+import re
+import socket
+import threading
 import time
 
 from sagemaker_training import entry_point, environment, mapping, runner
-import tensorflow as tf
 
 from sagemaker_tensorflow_container import s3_utils
 
@@ -32,13 +33,22 @@ SAGEMAKER_MULTI_WORKER_MIRRORED_STRATEGY_ENABLED = (
     "sagemaker_multi_worker_mirrored_strategy_enabled"
 )
 MODEL_DIR = "/opt/ml/model"
+SAVED_MODEL_FILES = frozenset({"saved_model.pb", "saved_model.pbtxt"})
+
+# SavedModel version directories must be plain decimal; str.isdigit also accepts
+# unicode digit codepoints, which TensorFlow Serving would reject.
+_DIGIT_RE = re.compile(r"\A[0-9]+\Z")
 
 
 def _is_host_master(hosts, current_host):
     return current_host == hosts[0]
 
 
-def _build_tf_config_for_ps(hosts, current_host, ps_task=False):
+def _host_addresses(hosts, port):
+    return [f"{host}:{port}" for host in hosts]
+
+
+def _build_tf_config_for_ps(hosts, current_host, ps_task=False, host_index=None):
     """Builds a dictionary containing cluster information based on number of hosts and number of
     parameter servers.
 
@@ -47,6 +57,8 @@ def _build_tf_config_for_ps(hosts, current_host, ps_task=False):
         current_host (str): Current host name
         ps_task (bool): Set to True if this config is built for a parameter server process
             (default: False)
+        host_index (int): Position of current_host in hosts, if already known by the caller
+            (default: None, meaning it is looked up here)
 
     Returns:
         dict[str: dict]: A dictionary describing the cluster setup for distributed training.
@@ -59,16 +71,16 @@ def _build_tf_config_for_ps(hosts, current_host, ps_task=False):
     workers = hosts[1:]
     ps = hosts if len(hosts) > 1 else None
 
-    def host_addresses(hosts, port=2222):
-        return ["{}:{}".format(host, port) for host in hosts]
+    if host_index is None:
+        host_index = hosts.index(current_host)
 
-    tf_config = {"cluster": {"master": host_addresses(masters)}, "environment": "cloud"}
+    tf_config = {"cluster": {"master": _host_addresses(masters, 2222)}, "environment": "cloud"}
 
     if ps:
-        tf_config["cluster"]["ps"] = host_addresses(ps, port="2223")
+        tf_config["cluster"]["ps"] = _host_addresses(ps, 2223)
 
     if workers:
-        tf_config["cluster"]["worker"] = host_addresses(workers)
+        tf_config["cluster"]["worker"] = _host_addresses(workers, 2222)
 
     if ps_task:
         if ps is None:
@@ -76,25 +88,28 @@ def _build_tf_config_for_ps(hosts, current_host, ps_task=False):
                 "Cannot have a ps task if there are no parameter servers in the cluster"
             )
         task_type = "ps"
-        task_index = ps.index(current_host)
+        task_index = host_index
     elif _is_host_master(hosts, current_host):
         task_type = "master"
         task_index = 0
     else:
+        # workers excludes the master at hosts[0], so shift the index down by one.
         task_type = "worker"
-        task_index = workers.index(current_host)
+        task_index = host_index - 1
 
     tf_config["task"] = {"index": task_index, "type": task_type}
     return tf_config
 
 
-def _build_tf_config_for_mwms(hosts, current_host):
+def _build_tf_config_for_mwms(hosts, current_host, host_index=None):
     """Builds a dictionary containing cluster information based on number of workers
     for Multi Worker Mirrored distribution strategy.
 
     Args:
         hosts (list[str]): List of host names in the cluster
         current_host (str): Current host name
+        host_index (int): Position of current_host in hosts, if already known by the caller
+            (default: None, meaning it is looked up here)
 
     Returns:
         dict[str: dict]: A dictionary describing the cluster setup for distributed training.
@@ -103,17 +118,23 @@ def _build_tf_config_for_mwms(hosts, current_host):
     """
     workers = hosts
 
-    def host_addresses(hosts, port=8890):
-        return ["{}:{}".format(host, port) for host in hosts]
+    if host_index is None:
+        host_index = hosts.index(current_host)
 
     tf_config = {"cluster": {}, "environment": "cloud"}
-    tf_config["cluster"]["worker"] = host_addresses(workers)
-    tf_config["task"] = {"index": workers.index(current_host), "type": "worker"}
+    tf_config["cluster"]["worker"] = _host_addresses(workers, 8890)
+    tf_config["task"] = {"index": host_index, "type": "worker"}
 
     return tf_config
 
 
 def _run_ps(env, cluster):
+    # TF is only needed to host the parameter server, so import it here rather
+    # than at module level; the multi-second import would otherwise be paid on
+    # every launch, including MPI/SMDataParallel ones where only the user entry
+    # point needs TF.
+    import tensorflow as tf
+
     logger.info("Running distributed training job with parameter servers")
 
     cluster_spec = tf.train.ClusterSpec(cluster)
@@ -127,12 +148,15 @@ def _run_ps(env, cluster):
         cluster_spec, job_name="ps", task_index=task_index, config=no_gpu_config
     )
 
-    multiprocessing.Process(target=lambda: server.join()).start()
+    # server.join() blocks in TF's C layer with the GIL released, so a daemon
+    # thread is enough here and avoids forking the interpreter with TF (and any
+    # CUDA context) already loaded.
+    threading.Thread(target=server.join, daemon=True).start()
 
 
-def _run_worker(env, cmd_args, tf_config):
-    env_vars = env.to_env_vars()
-    env_vars["TF_CONFIG"] = json.dumps(tf_config)
+def _run_worker(env, cmd_args, tf_config_json, env_vars):
+    env_vars = dict(env_vars)
+    env_vars["TF_CONFIG"] = tf_config_json
 
     entry_point.run(
         uri=env.module_dir,
@@ -146,15 +170,31 @@ def _run_worker(env, cmd_args, tf_config):
 def _wait_until_master_is_down(master):
     while True:
         try:
-            subprocess.check_call(
-                ["curl", "{}:2222".format(master)], stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            logger.info("master {} is still up, waiting for it to exit".format(master))
-            time.sleep(10)
-        except subprocess.CalledProcessError:
+            sock = socket.create_connection((master, 2222), timeout=2)
+        except OSError:
             logger.info("master {} is down, stopping parameter server".format(master))
             return
 
+        # Clear the connect timeout so the recv below blocks indefinitely
+        # instead of raising every 2 seconds.
+        sock.settimeout(None)
+        logger.info("master {} is up, waiting for it to exit".format(master))
+        try:
+            # Block until the master closes the connection. The kernel wakes us
+            # up the moment the peer sends FIN or RST, so there is no polling
+            # interval to wait out. The master's gRPC server also drops idle
+            # connections that never complete a handshake, so EOF alone is not
+            # proof that the master exited -- reconnect, and only treat a failed
+            # reconnect as the master being down.
+            while sock.recv(1):
+                pass
+        except OSError:
+            pass
+        finally:
+            sock.close()
+
+        time.sleep(1)
+
 
 def train(env, cmd_args):
     """Get training job environment from env and run the training job.
@@ -162,30 +202,62 @@ def train(env, cmd_args):
     Args:
         env (sagemaker_training.environment.Environment): Instance of Environment class
     """
+    framework_parameters = env.additional_framework_parameters
     parameter_server_enabled = (
-        env.additional_framework_parameters.get(SAGEMAKER_PARAMETER_SERVER_ENABLED, False)
+        framework_parameters.get(SAGEMAKER_PARAMETER_SERVER_ENABLED, False)
         and len(env.hosts) > 1
     )
-    multi_worker_mirrored_strategy_enabled = env.additional_framework_parameters.get(
+    multi_worker_mirrored_strategy_enabled = framework_parameters.get(
         SAGEMAKER_MULTI_WORKER_MIRRORED_STRATEGY_ENABLED, False
     )
-    sagemaker_distributed_dataparallel_enabled = env.additional_framework_parameters.get(
+    sagemaker_distributed_dataparallel_enabled = framework_parameters.get(
         SAGEMAKER_DISTRIBUTED_DATAPARALLEL_ENABLED, False
     )
+    mpi_enabled = framework_parameters.get("sagemaker_mpi_enabled", False)
+
+    in_distribution_group = env.current_instance_group in set(env.distribution_instance_groups)
 
     env_vars = env.to_env_vars()
 
+    # Single-host jobs that don't use a distributed launcher (the common
+    # single-instance, possibly multi-GPU case) need none of the TF_CONFIG
+    # machinery below; run the entry point directly.
+    if (
+        len(env.hosts) == 1
+        and not mpi_enabled
+        and not sagemaker_distributed_dataparallel_enabled
+    ):
+        entry_point.run(
+            uri=env.module_dir,
+            user_entry_point=env.user_entry_point,
+            args=cmd_args,
+            env_vars=env_vars,
+            capture_error=True,
+            runner_type=runner.ProcessRunnerType,
+        )
+        return
+
     # Setup
-    if env.current_instance_group in env.distribution_instance_groups:
+    if in_distribution_group:
+        host_index = env.distribution_hosts.index(env.current_host)
+
         if parameter_server_enabled:
 
-            tf_config = _build_tf_config_for_ps(hosts=env.distribution_hosts, current_host=env.current_host)
+            tf_config = _build_tf_config_for_ps(
+                hosts=env.distribution_hosts, current_host=env.current_host, host_index=host_index
+            )
+            # Compact separators keep the env-var blob passed through execve small;
+            # TFConfigClusterResolver re-parses it either way.
+            tf_config_json = json.dumps(tf_config, separators=(",", ":"))
             logger.info("Running distributed training job with parameter servers")
 
         elif multi_worker_mirrored_strategy_enabled:
 
             env_vars["TF_CONFIG"] = json.dumps(
-                _build_tf_config_for_mwms(hosts=env.distribution_hosts, current_host=env.current_host)
+                _build_tf_config_for_mwms(
+                    hosts=env.distribution_hosts, current_host=env.current_host, host_index=host_index
+                ),
+                separators=(",", ":"),
             )
             logger.info("Running distributed training job with multi_worker_mirrored_strategy setup")
 
@@ -197,15 +269,13 @@ def train(env, cmd_args):
         logger.info("Launching parameter server process")
         _run_ps(env, tf_config["cluster"])
         logger.info("Launching worker process")
-        _run_worker(env, cmd_args, tf_config)
+        _run_worker(env, cmd_args, tf_config_json, env_vars)
 
         if not _is_host_master(env.hosts, env.current_host):
             _wait_until_master_is_down(env.hosts[0])
 
     else:
-        if env.current_instance_group in env.distribution_instance_groups:
-            mpi_enabled = env.additional_framework_parameters.get("sagemaker_mpi_enabled")
-
+        if in_distribution_group:
             if mpi_enabled:
                 runner_type = runner.MPIRunnerType
             elif sagemaker_distributed_dataparallel_enabled:
@@ -221,23 +291,64 @@ def train(env, cmd_args):
         )
 
 
+def _walk_files(root):
+    """Walks the directory tree under root, yielding (dirpath, filenames) pairs.
+
+    Uses os.scandir so the file/directory distinction comes from the cached entry
+    type instead of an extra stat call per entry, which matters for SavedModels
+    with many variable shards.
+    """
+    subdirs = []
+    filenames = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    filenames.append(entry.name)
+    except OSError:
+        return
+    yield root, filenames
+    for subdir in subdirs:
+        yield from _walk_files(subdir)
+
+
 def _log_model_missing_warning(model_dir):
+    # Fast path: a servable model lives at model_dir/<version>/saved_model.pb, so a
+    # single scan of the top-level directory settles the common production case
+    # without walking the whole tree. On a miss, fall through to the full walk to
+    # keep the existing warning semantics.
+    try:
+        with os.scandir(model_dir) as entries:
+            for entry in entries:
+                if (
+                    entry.is_dir(follow_symlinks=False)
+                    and _DIGIT_RE.match(entry.name)
+                    and os.path.exists(os.path.join(entry.path, "saved_model.pb"))
+                ):
+                    return
+    except OSError:
+        pass
+
     pb_file_exists = False
     file_exists = False
-    for dirpath, dirnames, filenames in os.walk(model_dir):
+    for dirpath, filenames in _walk_files(model_dir):
         if filenames:
             file_exists = True
         for f in filenames:
-            if "saved_model.pb" in f or "saved_model.pbtxt" in f:
+            if f in SAVED_MODEL_FILES:
                 pb_file_exists = True
                 path, direct_parent_dir = os.path.split(dirpath)
-                if not str.isdigit(direct_parent_dir):
+                if not _DIGIT_RE.match(direct_parent_dir):
                     logger.warn(
                         "Your model will NOT be servable with SageMaker TensorFlow Serving containers. "
                         'The SavedModel bundle is under directory "{}", not a numeric name.'.format(
                             direct_parent_dir
                         )
                     )
+        if pb_file_exists and file_exists:
+            break
 
     if not file_exists:
         logger.warn(
@@ -259,7 +370,13 @@ def _log_model_missing_warning(model_dir):
 def _model_dir_with_training_job(model_dir, job_name):
     if model_dir and model_dir.startswith("/opt/ml"):
         return model_dir
+    elif model_dir:
+        # S3 URIs use forward slashes regardless of platform; stripping any
+        # trailing slash keeps the result free of empty path segments.
+        return posixpath.join(model_dir.rstrip("/"), job_name, "model")
     else:
+        # model_dir can be unset (e.g. estimators created with model_dir=False);
+        # preserve the historical string formatting for that case.
         return "{}/{}/model".format(model_dir, job_name)
 
 
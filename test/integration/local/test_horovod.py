@@ -12,8 +12,10 @@
 # language governing permissions and limitations under the License.
 from __future__ import absolute_import
 
+import concurrent.futures
 import json
 import os
+import sys
 import tarfile
 
 import pytest
@@ -70,9 +72,17 @@ def _test_distributed_training_horovod(
 
     size = instances * processes
 
-    for rank in range(size):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(32, size)) as executor:
+        results = list(
+            executor.map(
+                lambda rank: read_json("local-rank-%s-rank-%s" % (rank % processes, rank), tmp),
+                range(size),
+            )
+        )
+
+    for rank, result in enumerate(results):
         local_rank = rank % processes
-        assert read_json("local-rank-%s-rank-%s" % (local_rank, rank), tmp) == {
+        assert result == {
             "local-rank": local_rank,
             "rank": rank,
             "size": size,
@@ -94,24 +104,30 @@ def assert_files_exist_in_tar(output_path, files):
 
 
 def extract_files(output_path, tmpdir):
-    with tarfile.open(os.path.join(output_path, "model.tar.gz")) as tar:
-        def is_within_directory(directory, target):
-            
-            abs_directory = os.path.abspath(directory)
-            abs_target = os.path.abspath(target)
-        
-            prefix = os.path.commonprefix([abs_directory, abs_target])
-            
-            return prefix == abs_directory
-        
-        def safe_extract(tar, path=".", members=None, *, numeric_owner=False):
-        
-            for member in tar.getmembers():
-                member_path = os.path.join(path, member.name)
-                if not is_within_directory(path, member_path):
+    model_file = os.path.join(output_path, "model.tar.gz")
+
+    if sys.version_info >= (3, 12):
+        # Stream the archive through a fixed-size buffer instead of loading the
+        # whole member index; the "data" filter runs the same path-traversal
+        # check natively as each member goes by.
+        with tarfile.open(model_file, mode="r|gz") as tar:
+            tar.extractall(tmpdir, filter="data")
+        return
+
+    # Pre-3.12 the traversal check needs the full member list, which requires a
+    # seekable archive.
+    with tarfile.open(model_file) as tar:
+        def safe_extract(tar, path=".", *, numeric_owner=False):
+            # Read the member list once and reuse it for both the traversal
+            # check and the extraction, so the tar index is only walked once.
+            members = tar.getmembers()
+            abs_directory = os.path.abspath(path)
+
+            for member in members:
+                member_path = os.path.abspath(os.path.join(path, member.name))
+                if os.path.commonprefix([abs_directory, member_path]) != abs_directory:
                     raise Exception("Attempted Path Traversal in Tar File")
-        
-            tar.extractall(path, members, numeric_owner=numeric_owner) 
-            
-        
+
+            tar.extractall(path, members, numeric_owner=numeric_owner)
+
         safe_extract(tar, tmpdir)
@@ -99,6 +99,40 @@ def test_single_machine(run_module, single_machine_training_env):
     )
 
 
+@patch("sagemaker_training.entry_point.run")
+def test_single_host_short_circuit(run_module, single_machine_training_env):
+    single_machine_training_env.hosts = [HOST1]
+
+    training.train(single_machine_training_env, MODEL_DIR_CMD_LIST)
+    run_module.assert_called_with(
+        uri=MODULE_DIR,
+        user_entry_point=MODULE_NAME,
+        args=MODEL_DIR_CMD_LIST,
+        env_vars=single_machine_training_env.to_env_vars(),
+        capture_error=True,
+        runner_type=runner.ProcessRunnerType,
+    )
+
+
+@patch("sagemaker_training.entry_point.run")
+def test_single_host_mwms_skips_tf_config(run_module, single_machine_training_env):
+    single_machine_training_env.hosts = [HOST1]
+    single_machine_training_env.additional_framework_parameters[
+        training.SAGEMAKER_MULTI_WORKER_MIRRORED_STRATEGY_ENABLED
+    ] = True
+
+    training.train(single_machine_training_env, MODEL_DIR_CMD_LIST)
+    run_module.assert_called_with(
+        uri=MODULE_DIR,
+        user_entry_point=MODULE_NAME,
+        args=MODEL_DIR_CMD_LIST,
+        env_vars={},
+        capture_error=True,
+        runner_type=runner.ProcessRunnerType,
+    )
+    assert "TF_CONFIG" not in run_module.call_args.kwargs["env_vars"]
+
+
 @patch("sagemaker_training.entry_point.run")
 def test_train_horovod(run_module, single_machine_training_env):
     single_machine_training_env.additional_framework_parameters["sagemaker_mpi_enabled"] = True
@@ -139,8 +173,7 @@ def test_train_smdataparallel(run_module, single_machine_training_env):
 @patch("tensorflow.train.ClusterSpec")
 @patch("tensorflow.distribute.Server")
 @patch("sagemaker_training.entry_point.run")
-@patch("multiprocessing.Process", lambda target: target())
-@patch("time.sleep", MagicMock())
+@patch("threading.Thread", lambda target, daemon: target())
 def test_train_distributed_master(run, tf_server, cluster_spec, distributed_training_env):
     training.train(distributed_training_env, MODEL_DIR_CMD_LIST)
 
@@ -161,12 +194,12 @@ def test_train_distributed_master(run, tf_server, cluster_spec, distributed_trai
     tf_server().join.assert_called_with()
 
     tf_config = (
-        '{"cluster": {'
-        '"master": ["host1:2222"], '
-        '"ps": ["host1:2223", "host2:2223"], '
-        '"worker": ["host2:2222"]}, '
-        '"environment": "cloud", '
-        '"task": {"index": 0, "type": "master"}}'
+        '{"cluster":{'
+        '"master":["host1:2222"],'
+        '"ps":["host1:2223","host2:2223"],'
+        '"worker":["host2:2222"]},'
+        '"environment":"cloud",'
+        '"task":{"index":0,"type":"master"}}'
     )
 
     run.assert_called_with(
@@ -186,8 +219,7 @@ def test_train_distributed_master(run, tf_server, cluster_spec, distributed_trai
 @patch("tensorflow.train.ClusterSpec")
 @patch("tensorflow.distribute.Server")
 @patch("sagemaker_training.entry_point.run")
-@patch("multiprocessing.Process", lambda target: target())
-@patch("time.sleep", MagicMock())
+@patch("threading.Thread", lambda target, daemon: target())
 def test_train_distributed_worker(run, tf_server, cluster_spec, distributed_training_env):
     distributed_training_env.current_host = HOST2
 
@@ -210,12 +242,12 @@ def test_train_distributed_worker(run, tf_server, cluster_spec, distributed_trai
     tf_server().join.assert_called_with()
 
     tf_config = (
-        '{"cluster": {'
-        '"master": ["host1:2222"], '
-        '"ps": ["host1:2223", "host2:2223"], '
-        '"worker": ["host2:2222"]}, '
-        '"environment": "cloud", '
-        '"task": {"index": 0, "type": "worker"}}'
+        '{"cluster":{'
+        '"master":["host1:2222"],'
+        '"ps":["host1:2223","host2:2223"],'
+        '"worker":["host2:2222"]},'
+        '"environment":"cloud",'
+        '"task":{"index":0,"type":"worker"}}'
     )
 
     run.assert_called_with(